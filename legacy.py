@@ -17,6 +17,7 @@ import socket
 import time
 import sys
 import array
+import numpy as np
 
 DEST_IP_ADDR = "192.168.0.200"
 DEST_PORT = 1366
@@ -52,6 +53,9 @@ class mms101_evaboard_ethernet:
         # Open socket
         self.sockOpen()
 
+        # Receive function (debug variant only when debug print is enabled)
+        self._recv = self.recvDataDebug if self.debugMode == 1 else self.sockDsc.recv
+
         # Select Sensor
         self.sensorNo = SENSOR_NO1
 
@@ -87,8 +91,14 @@ class mms101_evaboard_ethernet:
     # Receive Data
     #====================
     def recvData(self, rcvLen):
+        return self._recv(rcvLen)
+
+    #====================
+    # Receive Data (debug)
+    #====================
+    def recvDataDebug(self, rcvLen):
         data = self.sockDsc.recv(rcvLen)
-        if self.debugMode == 1:
+        if len(data) != rcvLen:
             print(data.hex())
         return data
 
@@ -102,7 +112,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: START send")
 
-        data = self.recvData(2)
+        data = self._recv(2)
 
         #====================
         # Check whether the data is ready
@@ -120,7 +130,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: DATA send")
 
-        data = self.recvData(100)
+        data = self._recv(100)
         return data
 
     #====================
@@ -133,7 +143,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: RESTART send")
 
-        data = self.recvData(2)
+        data = self._recv(2)
 
         #====================
         # Check whether the data is ready
@@ -153,7 +163,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: BOOT send")
 
-        data = self.recvData(100)
+        data = self._recv(100)
 
         #====================
         # Check whether the data is ready
@@ -173,7 +183,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: STOP send")
 
-        data = self.recvData(2)
+        data = self._recv(2)
 
         #====================
         # Check whether the data is ready
@@ -195,7 +205,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: RESET send")
 
-        data = self.recvData(2)
+        data = self._recv(2)
 
         #====================
         # Check whether the data is ready
@@ -215,7 +225,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: STATUS send")
 
-        data = self.recvData(6)
+        data = self._recv(6)
 
         #====================
         # Check whether the data is ready
@@ -239,7 +249,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 3:
             print("Error: SELECT send")
 
-        data = self.recvData(2)
+        data = self._recv(2)
 
         #====================
         # Check whether the data is ready
@@ -259,7 +269,7 @@ class mms101_evaboard_ethernet:
         if sendSz != 1:
             print("Error: VERSION send")
 
-        data = self.recvData(8)
+        data = self._recv(8)
 
         #====================
         # Check whether the data is ready
@@ -308,18 +318,23 @@ mms101eb.cmdSelect()
 
 # Boot
 mms101eb.cmdBoot()
-while True:
+delay = 0.002
+for _ in range(200):
     # Check State
     status = mms101eb.cmdStatus()
     if status[4] == 0x03:
         # READY State
         break;
     elif status[4] == 0x02:
-        # Retry Wait
-        time.sleep(0.01)
+        # Retry Wait (exponential backoff, max 50ms)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.05)
     else:
         print("BOOT Error")
         exit()
+else:
+    print("BOOT Timeout")
+    exit()
 
 # Start
 mms101eb.cmdStart()
@@ -329,7 +344,9 @@ time.sleep(0.01)
 dataCounter = 0
 measureMax = 3000  # 예시 값
 elapsTime = 0
-mms101data = [[0]*6 for _ in range(5)]  # 5개의 센서, 각 센서당 6개의 데이터
+mms101data = np.empty((5, 6), dtype=np.float64)  # 5개의 센서, 각 센서당 6개의 데이터 (루프 밖에서 한 번만 할당)
+scales = np.array([1e-3, 1e-3, 1e-3, 1e-5, 1e-5, 1e-5])  # Fx,Fy,Fz [N] / Mx,My,Mz [N·m]
+lineFmt = '{},{:.3f},{},{}' + (',{:.3f}' * 3 + ',{:.5f}' * 3) * 5  # 한 줄 출력 포맷
 
 print("Count[times],Time[s],Interval[us],DataUpdate[count],S1Fx[N],S1Fy[N],S1Fz[N],S1Mx[N],S1My[N],S1Mz[N],S2Fx[N],S2Fy[N],S2Fz[N],S2Mx[N],S2My[N],S2Mz[N],S3Fx[N],S3Fy[N],S3Fz[N],S3Mx[N],S3My[N],S3Mz[N],S4Fx[N],S4Fy[N],S4Fz[N],S4Mx[N],S4My[N],S4Mz[N],S5Fx[N],S5Fy[N],S5Fz[N],S5Mx[N],S5My[N],S5Mz[N]")
 # 데이터 처리 (센서별 데이터 분리)
@@ -342,31 +359,18 @@ while True:
             intervalTime = (rData[6] << 24) + (rData[7] << 16) + (rData[8] << 8) + rData[9]
             elapsTime += (intervalTime / 1000000)
             
-            # 센서별 데이터 파싱
-            for sens in range(5):  # 5개의 센서
-                for axis in range(6):  # Fx, Fy, Fz, Mx, My, Mz
-                    base_index = (sens * 18) + (axis * 3) + 10  # 각 센서 데이터의 시작 위치 계산
-                    mms101data[sens][axis] = (rData[base_index] << 16) + (rData[base_index + 1] << 8) + rData[base_index + 2]
-                    if mms101data[sens][axis] >= 0x00800000:
-                        mms101data[sens][axis] -= 0x1000000  # 음수 처리
-
-                # 변환
-                mms101data[sens][0] /= 1000  # Fx
-                mms101data[sens][1] /= 1000  # Fy
-                mms101data[sens][2] /= 1000  # Fz
-                mms101data[sens][3] /= 100000  # Mx
-                mms101data[sens][4] /= 100000  # My
-                mms101data[sens][5] /= 100000  # Mz
+            # 센서별 데이터 파싱 (24bit big-endian → 부호 확장 → 단위 변환)
+            # 각 필드 앞 1바이트부터 4바이트를 big-endian int32로 읽고 (byte swap)
+            # << 8 >> 8 로 앞 바이트 제거 + 음수 처리
+            raw = np.ndarray((5, 6), dtype='>i4', buffer=rData, offset=9, strides=(18, 3))
+            val = (raw.astype(np.int32) << 8) >> 8
+            np.multiply(val, scales, out=mms101data)
 
             # 결과 출력
-            print(f'{dataCounter},{elapsTime:.3f},{intervalTime},{measCount}', end="")
-            for sens in range(5):  # 각 센서별 데이터 출력
-                print(f',{mms101data[sens][0]:.3f},{mms101data[sens][1]:.3f},{mms101data[sens][2]:.3f},{mms101data[sens][3]:.5f},{mms101data[sens][4]:.5f},{mms101data[sens][5]:.5f}', end="")
-            print()  # 줄바꿈
+            print(lineFmt.format(dataCounter, elapsTime, intervalTime, measCount, *mms101data.ravel().tolist()))
         else:
             print('Error: Result data', len(rData))
 
         dataCounter += 1
-        time.sleep(0.001)
     else:
         break  # 측정이 완료되면 루프 종료
\ No newline at end of file
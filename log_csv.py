@@ -11,6 +11,7 @@ Default output: outputs/YYYY-MM-DD/HH-MM-SS/mms101_log.csv
 import argparse
 import csv
 import os
+import signal
 from datetime import datetime
 import time
 from types import SimpleNamespace
@@ -19,6 +20,10 @@ import numpy as np
 
 from mms101_controller import MMS101Controller
 
+BATCH_ROWS = 256
+FILE_BUFFER = 1 << 20   # bytes; the OS write happens when this fills, not per batch
+CSV_HEADER = ['time_iso', 't_elapsed_s', 'sample_idx', 'sensor_idx', 'Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz']
+
 
 def load_config(path: str):
     with open(path, 'r') as f:
@@ -55,11 +60,63 @@ def parse_sensors(arg: str | None, single: int | None, total: int) -> list[int]:
     return list(range(total))
 
 
+class RowBatch:
+    """Collects rows and writes them as one pre-formatted block per batch.
+
+    time_iso is derived from t0_wall + t_elapsed when the batch is written,
+    so the sample loop never calls datetime.now().
+    """
+
+    def __init__(self, f, t0_wall: float, size: int = BATCH_ROWS):
+        self.f = f
+        self.t0_wall = t0_wall
+        self.t = np.empty(size, dtype=np.float64)
+        self.idx = np.empty((size, 2), dtype=np.int64)
+        self.vals = np.empty((size, 6), dtype=np.float64)
+        self.n = 0
+        self._sec = None
+        self._sec_iso = ''
+
+    def add_sample(self, t_elapsed: float, sample_idx: int, sensor_rows: np.ndarray, d: np.ndarray) -> None:
+        """Append one row per entry of sensor_rows, taking values from d[sensor_rows]."""
+        k = len(sensor_rows)
+        if self.n + k > len(self.t):
+            self.flush()
+        n, end = self.n, self.n + k
+        self.t[n:end] = t_elapsed
+        self.idx[n:end, 0] = sample_idx
+        self.idx[n:end, 1] = sensor_rows
+        np.take(d, sensor_rows, axis=0, out=self.vals[n:end])
+        self.n = end
+
+    def _iso(self, t_elapsed: float) -> str:
+        # Same text as datetime.now().isoformat(timespec='milliseconds'),
+        # with the date/time part formatted once per second.
+        sec, ms = divmod(int((self.t0_wall + t_elapsed) * 1000), 1000)
+        if sec != self._sec:
+            self._sec = sec
+            self._sec_iso = datetime.fromtimestamp(sec).strftime('%Y-%m-%dT%H:%M:%S')
+        return f"{self._sec_iso}.{ms:03d}"
+
+    def flush(self) -> None:
+        n = self.n
+        if n == 0:
+            return
+        nums = np.char.mod('%.6f', self.vals[:n]).tolist()
+        ts = self.t[:n].tolist()
+        idx = self.idx[:n].tolist()
+        self.f.write(''.join(
+            f"{self._iso(t)},{t:.6f},{si},{sx}," + ','.join(r) + '\r\n'
+            for t, (si, sx), r in zip(ts, idx, nums)
+        ))
+        self.n = 0
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument('--config', default='config.yaml')
     p.add_argument('--output', default=None, help='CSV file path (default under outputs/YYYY-MM-DD/HH-MM-SS)')
-    p.add_argument('--interval', type=float, default=0.02, help='loop sleep seconds between reads')
+    p.add_argument('--interval', type=float, default=0.02, help='target seconds between reads (loop period)')
     p.add_argument('--samples', type=int, default=0, help='stop after N samples (0 = infinite)')
     p.add_argument('--duration', type=float, default=0.0, help='stop after seconds (0 = infinite)')
     p.add_argument('--sensor', type=int, default=None, help='single sensor index to log')
@@ -89,59 +146,55 @@ def main():
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
     ctrl = MMS101Controller(cfg)
+    sensors = [s for s in sensors if s < ctrl.n_sensors]
+    sensor_rows = np.array(sensors, dtype=np.intp)
+    n_rows = len(sensors)
 
     start = time.monotonic()
+    start_wall = time.time()
     written = 0
     i = 0
     end_time = start + args.duration if args.duration and args.duration > 0 else None
 
     mode = 'a' if args.append and os.path.exists(out_path) else 'w'
-    with open(out_path, mode, newline='') as f:
-        w = csv.writer(f)
+    # SIGTERM takes the same path as Ctrl-C so buffered rows are written on kill
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with open(out_path, mode, newline='', buffering=FILE_BUFFER) as f:
         if mode == 'w':
-            w.writerow(['time_iso', 't_elapsed_s', 'sample_idx', 'sensor_idx', 'Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz'])
+            csv.writer(f).writerow(CSV_HEADER)
+        batch = RowBatch(f, start_wall)
+        next_deadline = start
+        # Local binds for the sample loop
+        run, add_sample, monotonic, sleep = ctrl.run, batch.add_sample, time.monotonic, time.sleep
 
         try:
             while True:
                 if args.samples > 0 and written >= args.samples:
                     break
-                if end_time is not None and time.monotonic() >= end_time:
+                if end_time is not None and monotonic() >= end_time:
                     break
 
-                d = ctrl.run(i)
+                # Deadline pacing: period is max(interval, cycle time), no drift
+                slack = next_deadline - monotonic()
+                if slack > 0:
+                    sleep(slack)
+                else:
+                    next_deadline = monotonic()
+                next_deadline += args.interval
+
+                # run() always returns an (n_sensors, 6) ndarray
+                d = run(i)
                 i += 1
                 if d is None:
-                    time.sleep(args.interval)
                     continue
 
-                try:
-                    v = np.asarray(d)
-                    if v.ndim != 2 or v.shape[1] < 6:
-                        time.sleep(args.interval)
-                        continue
-                except Exception:
-                    time.sleep(args.interval)
-                    continue
-
-                t_elapsed = time.monotonic() - start
-                t_iso = datetime.now().isoformat(timespec='milliseconds')
-
-                for sidx in sensors:
-                    if sidx >= v.shape[0]:
-                        continue
-                    row = [t_iso, f"{t_elapsed:.6f}", i, sidx]
-                    vals = [float(v[sidx, j]) for j in range(6)]
-                    row.extend(vals)
-                    w.writerow(row)
-                    written += 1
-
-                # Flush occasionally
-                if written % 50 == 0:
-                    f.flush()
-
-                time.sleep(args.interval)
+                # All selected sensors' rows in one gather
+                add_sample(monotonic() - start, i, sensor_rows, d)
+                written += n_rows
         except KeyboardInterrupt:
             pass
+        finally:
+            batch.flush()
 
     print(f"CSV saved: {out_path} ({written} rows)")
 
@@ -155,41 +208,12 @@ def main():
 
 def plot_recorded_csv(csv_path: str, sensors: list[int], max_points: int = 20000, no_grid: bool = False) -> None:
     import matplotlib.pyplot as plt
+    import pandas as pd
 
-    # Prepare containers per sensor
-    data: dict[int, dict[str, list[float]]] = {}
-    for s in sensors:
-        data[s] = {
-            't': [], 'Fx': [], 'Fy': [], 'Fz': [], 'Tx': [], 'Ty': [], 'Tz': []
-        }
-
-    # Read CSV
-    with open(csv_path, 'r', newline='') as f:
-        r = csv.reader(f)
-        header = next(r, None)
-        for row in r:
-            if len(row) < 10:
-                continue
-            try:
-                t_elapsed = float(row[1])
-                sidx = int(row[3])
-                if sidx not in data:
-                    continue
-                vals = [float(row[j]) for j in range(4, 10)]
-            except Exception:
-                continue
-            d = data[sidx]
-            d['t'].append(t_elapsed)
-            d['Fx'].append(vals[0])
-            d['Fy'].append(vals[1])
-            d['Fz'].append(vals[2])
-            d['Tx'].append(vals[3])
-            d['Ty'].append(vals[4])
-            d['Tz'].append(vals[5])
-
-    # Downsample helper
-    def ds(x: list[float], stride: int) -> list[float]:
-        return x[::stride] if stride > 1 else x
+    # Read CSV in pandas' C parser; one group of ndarray columns per sensor
+    df = pd.read_csv(csv_path, usecols=['t_elapsed_s', 'sensor_idx', 'Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz'],
+                     on_bad_lines='skip')
+    groups = {int(sidx): g for sidx, g in df[df['sensor_idx'].isin(sensors)].groupby('sensor_idx')}
 
     # Build figure
     fig, axs = plt.subplots(2, 3, figsize=(13, 6), sharex=True)
@@ -203,12 +227,13 @@ def plot_recorded_csv(csv_path: str, sensors: list[int], max_points: int = 20000
         ax.grid(not no_grid)
         key = comp_keys[ci]
         for si, sidx in enumerate(sensors):
-            d = data.get(sidx)
-            if not d or not d['t']:
+            g = groups.get(sidx)
+            if g is None or g.empty:
                 continue
-            n = len(d['t'])
-            stride = max(1, (n // max_points))
-            ax.plot(ds(d['t'], stride), ds(d[key], stride), '-', color=colors[si % len(colors)], label=f'S{sidx}')
+            stride = max(1, (len(g) // max_points))
+            t = g['t_elapsed_s'].to_numpy()[::stride]
+            y = g[key].to_numpy()[::stride]
+            ax.plot(t, y, '-', color=colors[si % len(colors)], label=f'S{sidx}')
 
     axs[0].legend(loc='upper right', ncols=min(len(sensors), 3), fontsize=8)
     axs[3].set_xlabel('Time [s]')
@@ -1,10 +1,17 @@
+import selectors
 import socket
 import time
 import sys
-import array
+import ctypes
+import functools
 import numpy as np
 from omegaconf import DictConfig
 
+try:
+    from numba import njit
+except ImportError:     # optional: fall back to the NumPy decoder
+    njit = None
+
 # Sensor Constants
 PROTOCOL_SPI = 0x01
 SENSOR_MAP = {
@@ -15,6 +22,159 @@ SENSOR_MAP = {
     5: 0x10
 }
 
+# Command payloads (prebuilt; SELECT depends on the sensor mask)
+CMD_STATUS = b"\x80"
+CMD_SELECT = 0xA0
+CMD_VERSION = b"\xA2"
+CMD_BOOT = b"\xB0"
+CMD_STOP = b"\xB2"
+CMD_RESET = b"\xB4"
+CMD_RESTART = b"\xC0"
+CMD_DATA = b"\xE0"
+CMD_START = b"\xF0"
+
+RECV_TIMEOUT = 0.8  # seconds to wait for a reply before giving up
+PIPELINE_GAP = 0.02 # replies to queued commands arrive back to back; a longer gap means drops
+FRAME_LEN = 100     # DATA response size in bytes
+SOCK_BUF_SIZE = 4 * 1024 * 1024  # requested SO_RCVBUF / SO_SNDBUF
+STATUS_POLL_MIN = 0.002  # STATUS poll backoff while booting (seconds)
+STATUS_POLL_MAX = 0.05
+
+
+# ── Compiled decoder (numba) ──────────────────────────────────
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _decode_frame(raw, n_sensors, out):
+        """Decode one DATA frame (uint8 array) into out[n_sensors, 6]."""
+        for s in range(n_sensors):
+            for a in range(6):
+                idx = s * 18 + a * 3 + 10
+                v = (np.int32(raw[idx]) << 16) | (np.int32(raw[idx + 1]) << 8) | np.int32(raw[idx + 2])
+                if v & 0x800000:
+                    v -= 0x1000000
+                out[s, a] = v * (1e-3 if a < 3 else 1e-5)
+else:
+    _decode_frame = None
+
+
+# ── Batched receive (recvmmsg) ────────────────────────────────
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)), ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_recvmmsg = _sendmmsg = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _recvmmsg = _libc.recvmmsg
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint,
+                              ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype = ctypes.c_int
+        _sendmmsg = _libc.sendmmsg
+        _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        _sendmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError, TypeError):   # no glibc (e.g. musl without the symbols)
+        _recvmmsg = _sendmmsg = None
+
+
+_recv_buffers = {}     # bufsize -> (buf, iov, msgs), grown to the largest n seen
+
+
+def _mmsg_buffers(n, bufsize):
+    """One contiguous receive buffer plus at least n mmsghdr slots pointing into it."""
+    cached = _recv_buffers.get(bufsize)
+    if cached is not None and len(cached[2]) >= n:
+        return cached
+    buf = (ctypes.c_char * (n * bufsize))()
+    iov = (_IOVec * n)()
+    msgs = (_MMsgHdr * n)()
+    base = ctypes.addressof(buf)
+    for k in range(n):
+        iov[k].iov_base = base + k * bufsize
+        iov[k].iov_len = bufsize
+        msgs[k].msg_hdr.msg_iov = ctypes.pointer(iov[k])
+        msgs[k].msg_hdr.msg_iovlen = 1
+    _recv_buffers[bufsize] = buf, iov, msgs
+    return buf, iov, msgs
+
+
+@functools.lru_cache(maxsize=None)
+def _mmsg_payloads(payloads):
+    """mmsghdr slots for a fixed sequence of payloads (peer set by connect)."""
+    n = len(payloads)
+    bufs = [ctypes.create_string_buffer(p, len(p)) for p in payloads]
+    iov = (_IOVec * n)()
+    msgs = (_MMsgHdr * n)()
+    for k, b in enumerate(bufs):
+        iov[k].iov_base = ctypes.addressof(b)
+        iov[k].iov_len = len(payloads[k])
+        msgs[k].msg_hdr.msg_iov = ctypes.pointer(iov[k])
+        msgs[k].msg_hdr.msg_iovlen = 1
+    return bufs, iov, msgs
+
+
+def sendmmsg_batch(sock, payloads):
+    """Send a sequence of datagrams on a connected socket in one syscall.
+
+    Returns the number of datagrams sent. Falls back to repeated send()
+    where sendmmsg(2) is unavailable.
+    """
+    payloads = tuple(payloads)
+    n = len(payloads)
+    if _sendmmsg is None:
+        for p in payloads:
+            sock.send(p)
+        return n
+
+    _, _, msgs = _mmsg_payloads(payloads)
+    base = ctypes.addressof(msgs)
+    sent = 0
+    while sent < n:     # sendmmsg may stop early; resume from the first unsent slot
+        slot = ctypes.cast(base + sent * ctypes.sizeof(_MMsgHdr), ctypes.POINTER(_MMsgHdr))
+        r = _sendmmsg(sock.fileno(), slot, n - sent, 0)
+        if r <= 0:
+            break
+        sent += r
+    return sent
+
+
+def recvmmsg_batch(sock, n, bufsize):
+    """Drain up to n queued datagrams in one syscall. Returns list of bytes.
+
+    Falls back to repeated recv() where recvmmsg(2) is unavailable; that
+    path relies on the socket being non-blocking (as sockOpen leaves it).
+    """
+    if _recvmmsg is None:
+        out = []
+        for _ in range(n):
+            try:
+                out.append(sock.recv(bufsize))
+            except (BlockingIOError, ConnectionRefusedError):
+                break
+        return out
+
+    buf, _, msgs = _mmsg_buffers(n, bufsize)
+    got = _recvmmsg(sock.fileno(), msgs, n, socket.MSG_DONTWAIT, None)
+    if got < 0:
+        return []
+    base = ctypes.addressof(buf)
+    return [ctypes.string_at(base + k * bufsize, msgs[k].msg_len) for k in range(got)]
+
 
 class MMS101Controller:
     def __init__(self, config):
@@ -24,6 +184,8 @@ class MMS101Controller:
         self.src_port = cfg.src_port
         self.measure_max = cfg.measure_max
         self.debug_mode = cfg.debug
+        if self.debug_mode:
+            self._recv = self._recv_debug
         self.sensors = cfg.sensors
         self.n_sensors = cfg.n_sensors
 
@@ -31,11 +193,23 @@ class MMS101Controller:
         self.sums = np.zeros([self.n_sensors, 6])
         self.contact_flag = 0
         self.offset = np.zeros([self.n_sensors, 6])
+        self._sensed = np.empty_like(self.offset)   # scratch for _update_offset
+        self._result = np.empty_like(self.offset)   # returned by run(), reused every cycle
+
+        # DATA frame layout: 18 bytes (6 axes × 24-bit BE) per sensor from byte 10
+        self._scale = np.array([1000, 1000, 1000, 100000, 100000, 100000], dtype=np.float64)
+        self._out = np.empty((self.n_sensors, 6))   # numba decoder output
+        # Pure-Python single-frame path: field offsets and per-field scale
+        self._offsets = [(s * 18) + (a * 3) + 10 for s in range(self.n_sensors) for a in range(6)]
+        self._field_scale = ((1e-3,) * 3 + (1e-5,) * 3) * self.n_sensors
 
         self.destAddr = (self.dest_ip, self.dest_port)
         self.srcAddr = ("", self.src_port)
         self.sockOpenFlag = 0
+        self._start_in_flight = False   # START sent ahead by run(), ack not read yet
+        self._pipeline_depth = 0        # 0 = unlimited; 1 once the device drops queued commands
         self.sensorNo = self._select_sensors(self.sensors)
+        self._cmd_select = bytes([CMD_SELECT, PROTOCOL_SPI, self.sensorNo])
         self.sockOpen()
 
         self._init_device()
@@ -48,21 +222,24 @@ class MMS101Controller:
         self.cmdBoot()
         time.sleep(0.05)
 
-        t0 = time.time()
-        while time.time() - t0 < 5.0:
+        t0 = time.monotonic()
+        delay = STATUS_POLL_MIN
+        while time.monotonic() - t0 < 5.0:
             status = self.cmdStatus()
             if not status or len(status) < 5:
                 continue
             if status[4] == 0x03:       # READY
                 return
-            elif status[4] == 0x02:     # WAIT
-                time.sleep(0.01)
+            elif status[4] == 0x02:     # WAIT → back off between polls
+                time.sleep(delay)
+                delay = min(delay * 1.5, STATUS_POLL_MAX)
             else:                       # ERROR → retry
                 if self.debug_mode:
                     print("[init] error state, retrying reset/select/boot")
                 self.cmdReset(); time.sleep(0.02)
                 self.cmdSelect(); time.sleep(0.02)
                 self.cmdBoot(); time.sleep(0.05)
+                delay = STATUS_POLL_MIN
 
         print("[init] timeout: device not READY")
         sys.exit(1)
@@ -74,74 +251,112 @@ class MMS101Controller:
 
     def sockOpen(self):
         self.sockDsc = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Quick restarts can rebind the source port; big buffers keep the
+        # kernel from dropping DATA replies while the reader is stalled
+        self.sockDsc.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sockDsc.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCK_BUF_SIZE)
+        self.sockDsc.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCK_BUF_SIZE)
+        rcvbuf = self.sockDsc.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if rcvbuf < SOCK_BUF_SIZE:
+            print(f"[sock] SO_RCVBUF clamped to {rcvbuf} bytes "
+                  f"(raise net.core.rmem_max to allow {SOCK_BUF_SIZE})")
         self.sockDsc.bind(self.srcAddr)
-        # Avoid infinite blocking on recv
-        self.sockDsc.settimeout(0.8)
+        # Fix the peer once: send()/recv() skip per-call address handling and
+        # the kernel drops datagrams from any other source
+        self.sockDsc.connect(self.destAddr)
+        # Wake on reply readiness (epoll on Linux) instead of blocking recv
+        self.sockDsc.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self.sockDsc, selectors.EVENT_READ)
+        # Bound once: avoids attribute lookups on every command/reply
+        self._send = self.sockDsc.send
+        self._sock_recv = self.sockDsc.recv
+        self._select = self._sel.select
         self.sockOpenFlag = 1
 
     def sockClose(self):
         if self.sockOpenFlag:
             self.cmdStop()
+            self._sel.close()
             self.sockDsc.close()
             self.sockOpenFlag = 0
 
     # ── Low-level I/O ─────────────────────────────────────────
 
     def recvData(self, rcvLen):
-        try:
-            data = self.sockDsc.recv(rcvLen)
-            if self.debug_mode:
-                print(data.hex())
-            return data
-        except socket.timeout:
-            if self.debug_mode:
-                print(f"[timeout] expecting {rcvLen} bytes")
-            return b""
+        return self._recv(rcvLen)
+
+    def _recv_fast(self, rcvLen):
+        if self._select(RECV_TIMEOUT):
+            try:
+                return self._sock_recv(rcvLen)
+            except (BlockingIOError, ConnectionRefusedError):
+                pass
+        return b""
+
+    def _recv_debug(self, rcvLen):
+        data = self._recv_fast(rcvLen)
+        if not data:
+            print(f"[timeout] expecting {rcvLen} bytes")
+        elif len(data) != rcvLen:
+            # only stringify unexpected replies, not steady-state traffic
+            print(f"[recv] {len(data)}/{rcvLen} bytes: {data.hex()}")
+        return data
+
+    # Class-level default avoids a bound-method reference cycle on self,
+    # so __del__ (which sends STOP) still runs as soon as the last reference drops
+    _recv = _recv_fast
 
     # ── Commands ──────────────────────────────────────────────
 
     def cmdStart(self):
-        self.send_cmd([0xF0])
-        return self.recvData(2)
+        self.send_cmd(CMD_START)
+        return self._recv(2)
 
     def cmdData(self):
-        self.send_cmd([0xE0])
-        return self.recvData(100)
+        self.send_cmd(CMD_DATA)
+        return self._recv(100)
 
     def cmdRestart(self):
-        self.send_cmd([0xC0])
-        return self.recvData(2)
+        self.send_cmd(CMD_RESTART)
+        return self._recv(2)
 
     def cmdBoot(self):
-        self.send_cmd([0xB0])
-        return self.recvData(100)
+        self.send_cmd(CMD_BOOT)
+        return self._recv(100)
 
     def cmdStop(self):
-        self.send_cmd([0xB2])
-        return self.recvData(2)
+        self.send_cmd(CMD_STOP)
+        return self._recv(2)
 
     def cmdReset(self):
-        self.send_cmd([0xB4])
-        return self.recvData(2)
+        self.send_cmd(CMD_RESET)
+        return self._recv(2)
 
     def cmdStatus(self):
-        self.send_cmd([0x80])
-        return self.recvData(6)
+        self.send_cmd(CMD_STATUS)
+        return self._recv(6)
 
     def cmdSelect(self):
-        self.send_cmd([0xA0, PROTOCOL_SPI, self.sensorNo])
-        return self.recvData(2)
+        self.send_cmd(self._cmd_select)
+        return self._recv(2)
 
     def cmdVersion(self):
-        self.send_cmd([0xA2])
-        return self.recvData(8)
+        self.send_cmd(CMD_VERSION)
+        return self._recv(8)
 
     # ── Helpers ───────────────────────────────────────────────
 
     def send_cmd(self, cmd):
-        sent = self.sockDsc.sendto(array.array('B', cmd), self.destAddr)
+        """Send a prebuilt command payload (bytes)."""
+        if self._start_in_flight:   # keep replies in step with commands
+            self._reap_start()
+        try:
+            sent = self._send(cmd)
+        except ConnectionRefusedError:  # ICMP unreachable from a previous send
+            sent = 0
         if sent != len(cmd):
-            print(f"[ERROR] send failed: {cmd}")
+            print(f"[ERROR] send failed: {cmd.hex()}")
 
     @staticmethod
     def _select_sensors(sensor_list):
@@ -155,20 +370,34 @@ class MMS101Controller:
 
     def _parse_data(self, raw):
         """Parse 100-byte DATA response → (n_sensors, 6) ndarray."""
-        data = np.zeros([self.n_sensors, 6])
-        for sens in range(self.n_sensors):
-            for axis in range(6):
-                idx = (sens * 18) + (axis * 3) + 10
-                val = (raw[idx] << 16) | (raw[idx + 1] << 8) | raw[idx + 2]
-                if val >= 0x00800000:
-                    val -= 0x1000000
-                data[sens][axis] = val / (1000 if axis < 3 else 100000)
-        return data
+        if _decode_frame is not None:
+            _decode_frame(np.frombuffer(raw, dtype=np.uint8), self.n_sensors, self._out)
+            return self._out
+        # For a single frame int.from_bytes (C, handles sign) beats NumPy's
+        # per-call setup; the strided NumPy decode is kept for batches
+        mv = memoryview(raw)
+        vals = [int.from_bytes(mv[o:o + 3], 'big', signed=True) * k
+                for o, k in zip(self._offsets, self._field_scale)]
+        return np.array(vals).reshape(self.n_sensors, 6)
+
+    def _parse_batch(self, frames):
+        """Parse (k, 100) uint8 DATA responses → (k, n_sensors, 6) ndarray.
+
+        Each 24-bit field is read as the big-endian int32 that ends on it
+        (starting one byte early, so the view never runs past the frame);
+        the byte swap happens in astype and << 8 >> 8 drops the leading
+        byte while sign-extending.
+        """
+        frames = np.ascontiguousarray(frames)
+        w = np.ndarray((len(frames), self.n_sensors, 6), dtype='>i4', buffer=frames,
+                       offset=9, strides=(FRAME_LEN, 18, 3))
+        val = (w.astype(np.int32) << 8) >> 8
+        return val / self._scale
 
     def _update_offset(self, raw_data, period):
-        """Dynamically calibrate zero-offset."""
-        sensed = raw_data - self.offset
-        if np.abs(sensed.sum()) > 0.1 and period > 5000:
+        """Dynamically calibrate zero-offset (in place, no per-sample allocation)."""
+        np.subtract(raw_data, self.offset, out=self._sensed)
+        if abs(float(self._sensed.sum())) > 0.1 and period > 5000:
             self.contact_flag = 1
         else:
             self.contact_flag = 0
@@ -177,21 +406,119 @@ class MMS101Controller:
             self.sums += raw_data
             self.n_samples += 1
             if self.n_samples > 300:
-                self.offset = self.sums / self.n_samples
+                np.divide(self.sums, self.n_samples, out=self.offset)
                 self.n_samples = 0
-                self.sums = np.zeros([self.n_sensors, 6])
+                self.sums.fill(0)
+
+    def _reap_start(self):
+        """Consume the ack of a START that run() sent ahead, if any."""
+        if self._start_in_flight:
+            self._start_in_flight = False
+            self._recv(2)
 
     def run(self, period):
-        """Single measurement cycle. Returns offset-corrected (n_sensors, 6) ndarray."""
-        self.cmdStart()
-        time.sleep(0.0001)
+        """Single measurement cycle. Returns offset-corrected (n_sensors, 6) ndarray.
+
+        The returned array is owned by the controller and overwritten by the
+        next call; copy it if it must outlive the cycle.
+        Pipelined: the START for the next cycle is sent as soon as this
+        cycle's DATA reply arrives, so no sleep is needed between commands.
+        """
+        recv, send_cmd = self._recv, self.send_cmd
+        if self._start_in_flight:
+            self._start_in_flight = False
+        else:
+            send_cmd(CMD_START)
+        recv(2)                         # START ack
 
-        rData = self.cmdData()
-        if len(rData) != 100 or rData[0] != 0x00:
-            return np.zeros([self.n_sensors, 6])
+        send_cmd(CMD_DATA)
+        rData = recv(FRAME_LEN)
+        if len(rData) != FRAME_LEN or rData[0] != 0x00:
+            self._result.fill(0.0)
+            return self._result
+
+        send_cmd(CMD_START)
+        self._start_in_flight = True
 
         mms101data = self._parse_data(rData)
         self._update_offset(mms101data, period)
 
-        return mms101data - self.offset
+        return np.subtract(mms101data, self.offset, out=self._result)
+
+    def _acquire_one(self):
+        """One unpipelined START -> ack -> DATA -> reply cycle. Returns the DATA frame or None."""
+        self.send_cmd(CMD_START)
+        self._recv(2)
+        self.send_cmd(CMD_DATA)
+        frame = self._recv(FRAME_LEN)
+        return frame if len(frame) == FRAME_LEN and frame[0] == 0x00 else None
+
+    def pipelined_acquire(self, n):
+        """Queue n START then n DATA requests, then reap all replies at once.
+
+        Requests go out in one sendmmsg call; replies are drained with
+        recvmmsg and decoded in a single NumPy pass.
+        If a round comes back short (the device drops queued commands), this
+        and later calls fall back to one START/DATA pair at a time.
+
+        Returns (data, meas_count, interval): data is (k, n_sensors, 6) with
+        k <= n, not offset-corrected; k < n only if the device stops answering.
+        meas_count (uint16, frame bytes 4-5) and interval (uint32, bytes 6-9)
+        are the per-frame header fields, so callers can drop repeated reads of
+        one measurement and timestamp the rest.
+        """
+        frames = []
+        while len(frames) < n:
+            want = n - len(frames)
+            if self._pipeline_depth == 1:
+                frame = self._acquire_one()
+                if frame is None:
+                    break       # no reply within RECV_TIMEOUT: return what we have
+                frames.append(frame)
+                continue
 
+            depth = min(self._pipeline_depth or want, want)
+            self._reap_start()
+            cmds = (CMD_START,) * depth + (CMD_DATA,) * depth
+            sent = sendmmsg_batch(self.sockDsc, cmds)
+            if sent != len(cmds):
+                print(f"[ERROR] send failed: {sent}/{len(cmds)} queued commands")
+
+            got = []
+            pending = 2 * depth     # START acks + DATA replies
+            timeout = RECV_TIMEOUT
+            while pending > 0 and self._sel.select(timeout):
+                batch = recvmmsg_batch(self.sockDsc, pending, FRAME_LEN)
+                pending -= len(batch)
+                got += [f for f in batch if len(f) == FRAME_LEN and f[0] == 0x00]
+                timeout = PIPELINE_GAP
+            if len(got) < depth:
+                if self.debug_mode:
+                    print(f"[pipeline] {len(got)}/{depth} replies, falling back to one pair at a time")
+                self._pipeline_depth = 1
+            frames += got
+
+        if not frames:
+            return (np.zeros([0, self.n_sensors, 6]), np.zeros(0, dtype=np.uint16),
+                    np.zeros(0, dtype=np.uint32))
+        raw = np.frombuffer(b"".join(frames), dtype=np.uint8).reshape(-1, FRAME_LEN)
+        # Header fields, big-endian: measCount at bytes 4-5, interval at 6-9
+        meas_count = raw[:, 4:6].copy().view('>u2')[:, 0].astype(np.uint16)
+        interval = raw[:, 6:10].copy().view('>u4')[:, 0].astype(np.uint32)
+        return self._parse_batch(raw), meas_count, interval
+
+    def run_batch(self, period, n=16):
+        """Pipelined measurement of up to n samples (see pipelined_acquire).
+
+        Returns (data, meas_count, interval) as pipelined_acquire does, with
+        data offset-corrected.
+
+        Opt-in API: log_csv and plot_live read one sample per run() call and
+        do not use this; call it where throughput matters more than
+        per-sample timing.
+        """
+        data, meas_count, interval = self.pipelined_acquire(n)
+        for k in range(len(data)):
+            self._update_offset(data[k], period + k)
+            data[k] -= self.offset
+        return data, meas_count, interval
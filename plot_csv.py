@@ -10,12 +10,51 @@ assuming the same order as above.
 """
 
 import argparse
-import csv
 import os
-from typing import Dict, List, Optional, Tuple
-import re
-
-import matplotlib.pyplot as plt
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Optional, Tuple
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:     # optional: NumPy fancy indexing is used instead
+    njit = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:     # optional: the wide layout is read with pandas instead
+    pa = pa_csv = None
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:     # optional: 'lttb' falls back to the NumPy MinMax buckets
+    MinMaxLTTBDownsampler = None
+
+AXES = ['Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz']
+# Wide-layout header prefix (upper-cased) -> canonical axis; Mx/My/Mz are torques
+AXIS_ALIASES = {'FX': 'Fx', 'FY': 'Fy', 'FZ': 'Fz',
+                'TX': 'Tx', 'TY': 'Ty', 'TZ': 'Tz',
+                'MX': 'Tx', 'MY': 'Ty', 'MZ': 'Tz'}
+CHUNK_ROWS = 1_000_000  # rows parsed per read_csv chunk; bounds peak parser memory
+SAVE_DPI = 150
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _scatter_wide(raw, col_map, out_axes):
+        """raw[rows, cols] -> out_axes[sensor, axis, row] via col_map[sensor, axis]."""
+        for r in range(raw.shape[0]):
+            for s in range(col_map.shape[0]):
+                for a in range(6):
+                    out_axes[s, a, r] = raw[r, col_map[s, a]]
+else:
+    def _scatter_wide(raw, col_map, out_axes):
+        """raw[rows, cols] -> out_axes[sensor, axis, row] via col_map[sensor, axis]."""
+        out_axes[...] = raw[:, col_map].transpose(1, 2, 0)
 
 
 def parse_sensors(arg: Optional[str], total_present: List[int]) -> List[int]:
@@ -34,7 +73,69 @@ def parse_sensors(arg: Optional[str], total_present: List[int]) -> List[int]:
     return sorted(total_present)
 
 
-def load_csv(csv_path: str) -> Tuple[Dict[int, Dict[str, List[float]]], List[int]]:
+def _numeric(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column as numbers; unparsable cells become NaN (rows dropped later)."""
+    return pd.to_numeric(df[col], errors='coerce')
+
+
+def _sensor_arrays(t: pd.Series, axes: Dict[str, pd.Series]) -> Dict[str, np.ndarray]:
+    """Contiguous per-sensor arrays: float64 time, float32 force/torque."""
+    d = {'t': t.to_numpy(dtype=np.float64)}
+    for k in AXES:
+        d[k] = axes[k].to_numpy(dtype=np.float32)
+    return d
+
+
+def _chunk_store() -> DefaultDict[int, DefaultDict[str, List[np.ndarray]]]:
+    """sensor id -> key -> per-chunk arrays; entries are created on first append."""
+    return defaultdict(lambda: defaultdict(list))
+
+
+def _append_chunk(parts: Dict[int, Dict[str, List[np.ndarray]]], sid: int,
+                  arrays: Dict[str, np.ndarray]) -> None:
+    """Queue one chunk's per-sensor arrays (parts from _chunk_store) for the final concatenation."""
+    cols = parts[sid]
+    for k, v in arrays.items():
+        cols[k].append(v)
+
+
+def _merge_chunks(parts: Dict[int, Dict[str, List[np.ndarray]]]) -> Dict[int, Dict[str, np.ndarray]]:
+    return {sid: {k: np.concatenate(v) for k, v in cols.items()} for sid, cols in parts.items()}
+
+
+def _arrow_blocks(csv_path: str, names: List[str]):
+    """Yield float64 (rows, len(names)) blocks of the named columns via pyarrow's CSV reader.
+
+    Raises pa.ArrowInvalid on a cell that is not a number; callers fall back to pandas.
+    """
+    reader = pa_csv.open_csv(csv_path, convert_options=pa_csv.ConvertOptions(
+        include_columns=names, column_types={n: pa.float64() for n in names}))
+    for batch in reader:
+        yield np.column_stack([col.to_numpy(zero_copy_only=False) for col in batch.columns])
+
+
+def _wide_parts(blocks, sids: List[int], col_map: np.ndarray, t_pos: int) -> Dict[int, Dict[str, List[np.ndarray]]]:
+    """Split float64 (rows, cols) blocks into per-sensor chunks; rows with non-finite values are dropped."""
+    parts = _chunk_store()
+    for raw in blocks:
+        # Scatter columns into (n_sensors, 6, n_rows) float32 planes in one pass
+        out_axes = np.empty((len(sids), 6, raw.shape[0]), dtype=np.float32)
+        _scatter_wide(raw, col_map, out_axes)
+
+        t = raw[:, t_pos]
+        t_ok = np.isfinite(t)
+        for s, sid in enumerate(sids):
+            mask = t_ok & np.isfinite(out_axes[s]).all(axis=0)
+            if not mask.any():
+                continue
+            chunk = {'t': t[mask]}
+            for a, k in enumerate(AXES):
+                chunk[k] = out_axes[s, a][mask]
+            _append_chunk(parts, sid, chunk)
+    return parts
+
+
+def load_csv(csv_path: str) -> Tuple[Dict[int, Dict[str, np.ndarray]], List[int]]:
     """
     Load CSV supporting two layouts:
 
@@ -44,182 +145,205 @@ def load_csv(csv_path: str) -> Tuple[Dict[int, Dict[str, List[float]]], List[int
     2) Wide format (all sensors per row) with columns like:
        t_sec, iter, Fx_1, Fy_1, Fz_1, Mx_1, My_1, Mz_1, Fx_2, ...
        (Torque columns may be Mx/My/Mz or Tx/Ty/Tz; suffix _<sensorId> optional for single sensor.)
-    """
-    with open(csv_path, 'r', newline='') as f:
-        r = csv.reader(f)
-        header = next(r, None)
-        if not header:
-            return {}, []
 
-        # Detect layout
-        long_layout = 'sensor_idx' in header or ('Fx' in header and 'Tx' in header and 'sensor_idx' in header)
-
-        data: Dict[int, Dict[str, List[float]]] = {}
-        present_set = set()
-
-        if long_layout:
-            # Original parser path
-            def idx(name: str, default: Optional[int] = None) -> Optional[int]:
-                if name in header:
-                    return header.index(name)
-                return default
-
-            i_t = idx('t_elapsed_s', None)
-            if i_t is None:
-                # fallback possible names
-                for cand in ['t_sec', 'time', 't']:
-                    if cand in header:
-                        i_t = header.index(cand)
-                        break
-            i_sidx = idx('sensor_idx', None)
-            named_axes = ['Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz']
-            axes_idx = [idx(n, None) for n in named_axes]
-            # Fallback positional if any missing
-            if any(a is None for a in axes_idx):
-                # Attempt torque synonyms Mx/My/Mz
-                torque_syn = {'Tx': ('Tx', 'Mx'), 'Ty': ('Ty', 'My'), 'Tz': ('Tz', 'Mz')}
-                for i, name in enumerate(named_axes):
-                    if axes_idx[i] is None:
-                        for alt in torque_syn.get(name, (name,)):
-                            if alt in header:
-                                axes_idx[i] = header.index(alt)
-                                break
-            if any(a is None for a in axes_idx):
-                # Last resort: assume indices
-                # Find starting index by locating first force-like column
-                start_guess = None
-                for candidate in ['Fx', 'Fx_1']:
-                    if candidate in header:
-                        start_guess = header.index(candidate)
-                        break
-                if start_guess is None:
-                    start_guess = 4
-                axes_idx = list(range(start_guess, start_guess + 6))
-
-            row_index = 0
-            for row in r:
-                row_index += 1
-                if not row:
-                    continue
-                try:
-                    # time fallback: use specified column or row count
-                    if i_t is not None and i_t < len(row):
-                        t = float(row[i_t])
-                    else:
-                        t = float(row_index)
-                    sidx = int(row[i_sidx]) if (i_sidx is not None and i_sidx < len(row)) else 0
-                    vals: List[float] = []
-                    ok = True
-                    for j in axes_idx:
-                        if j is None or j >= len(row):
-                            ok = False
-                            break
-                        try:
-                            vals.append(float(row[j]))
-                        except ValueError:
-                            ok = False
-                            break
-                    if not ok or len(vals) != 6:
-                        continue
-                except Exception:
-                    continue
-
-                present_set.add(sidx)
-                if sidx not in data:
-                    data[sidx] = {k: [] for k in ['t', 'Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz']}
-                d = data[sidx]
-                d['t'].append(t)
-                d['Fx'].append(vals[0])
-                d['Fy'].append(vals[1])
-                d['Fz'].append(vals[2])
-                d['Tx'].append(vals[3])
-                d['Ty'].append(vals[4])
-                d['Tz'].append(vals[5])
-            return data, sorted(present_set)
-
-        # Wide layout parsing
-        # Identify time column
-        time_col = None
-        for cand in ['t_elapsed_s', 't_sec', 'time', 't', 'timestamp']:
+    Parsing is done by pandas' C reader over the needed columns only, in chunks
+    of CHUNK_ROWS rows so large logs never sit in memory as one DataFrame; rows
+    with unparsable values are dropped. The all-numeric wide layout is read with
+    pyarrow's multi-threaded CSV reader when it is installed. Per-sensor values
+    are returned as ndarrays (float64 time, float32 Fx..Tz).
+    """
+    try:
+        header = list(pd.read_csv(csv_path, nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        return {}, []
+    if not header:
+        return {}, []
+
+    # Detect layout
+    long_layout = 'sensor_idx' in header
+
+    if long_layout:
+        parts = _chunk_store()
+        i_t = None
+        for cand in ['t_elapsed_s', 't_sec', 'time', 't']:
             if cand in header:
-                time_col = header.index(cand)
+                i_t = header.index(cand)
                 break
-        if time_col is None:
-            # fallback: first column
-            time_col = 0
-
-        # Build sensor axis map: sensor_id -> axis -> column index
-        # Accept patterns: Fx, Fy, Fz, Tx, Ty, Tz, Mx, My, Mz with optional _<id>
-        axis_pattern = re.compile(r'^(F[xyz]|T[xyz]|M[xyz])(?:_(\d+))?$', re.IGNORECASE)
-        sensor_axes: Dict[int, Dict[str, int]] = {}
-        for ci, name in enumerate(header):
-            m = axis_pattern.match(name)
-            if not m:
-                continue
-            axis_raw, sid_raw = m.group(1), m.group(2)
-            axis_norm = axis_raw.upper()
-            if axis_norm.startswith('M'):
-                # Map Mx/My/Mz -> Tx/Ty/Tz
-                axis_norm = 'T' + axis_norm[1]
-            # Force F? keep as is (Fx/Fy/Fz)
-            if axis_norm[0] not in ['F', 'T']:
-                continue
-            sid = int(sid_raw) if sid_raw is not None else 0
-            if sid not in sensor_axes:
-                sensor_axes[sid] = {}
-            sensor_axes[sid][axis_norm] = ci
-
-        if not sensor_axes:
-            return {}, []
-
-        # Prepare data containers
-        for sid in sensor_axes.keys():
-            data[sid] = {k: [] for k in ['t', 'Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz']}
-
-        for row in r:
-            if not row:
-                continue
-            try:
-                t = float(row[time_col]) if time_col < len(row) else float(len(data.get(0, {}).get('t', [])))
-            except Exception:
-                continue
-            for sid, axes_map in sensor_axes.items():
-                # Ensure all 6 axes exist; if any missing skip this sensor for this row
-                needed = {
-                    'Fx': axes_map.get('FX'), 'Fy': axes_map.get('FY'), 'Fz': axes_map.get('FZ'),
-                    'Tx': axes_map.get('TX'), 'Ty': axes_map.get('TY'), 'Tz': axes_map.get('TZ')
-                }
-                # Case-insensitive map attempt if uppercase keys not present
-                if any(v is None for v in needed.values()):
-                    # Rebuild with case-insensitive by scanning names again (rare)
-                    pass
-                try:
-                    vals_ok = True
-                    extracted = {}
-                    for k, col in needed.items():
-                        if col is None or col >= len(row):
-                            vals_ok = False
+        i_sidx = header.index('sensor_idx')
+        axes_idx = [header.index(n) if n in header else None for n in AXES]
+        # Fallback positional if any missing
+        if any(a is None for a in axes_idx):
+            # Attempt torque synonyms Mx/My/Mz
+            torque_syn = {'Tx': ('Tx', 'Mx'), 'Ty': ('Ty', 'My'), 'Tz': ('Tz', 'Mz')}
+            for i, name in enumerate(AXES):
+                if axes_idx[i] is None:
+                    for alt in torque_syn.get(name, (name,)):
+                        if alt in header:
+                            axes_idx[i] = header.index(alt)
                             break
-                        extracted[k] = float(row[col])
-                    if not vals_ok:
-                        continue
-                except Exception:
-                    continue
-                d = data[sid]
-                d['t'].append(t)
-                for k in ['Fx', 'Fy', 'Fz', 'Tx', 'Ty', 'Tz']:
-                    d[k].append(extracted[k])
-                present_set.add(sid)
-
-        return data, sorted(present_set)
+        if any(a is None for a in axes_idx):
+            # Last resort: assume indices
+            # Find starting index by locating first force-like column
+            start_guess = None
+            for candidate in ['Fx', 'Fx_1']:
+                if candidate in header:
+                    start_guess = header.index(candidate)
+                    break
+            if start_guess is None:
+                start_guess = 4
+            axes_idx = list(range(start_guess, start_guess + 6))
+        # Validate the resolved columns once, before any data is read: all in range,
+        # and no axis aliasing sensor_idx, the time column or another axis
+        if (axes_idx[-1] >= len(header) or len({i_sidx, *axes_idx}) != 1 + len(AXES)
+                or i_t in axes_idx):
+            return {}, []
 
+        names = [header[j] for j in axes_idx]
+        usecols = sorted({i_sidx, *axes_idx} | ({i_t} if i_t is not None else set()))
+        rows_seen = 0
+        for df in pd.read_csv(csv_path, usecols=usecols, engine='c', chunksize=CHUNK_ROWS):
+            frame = pd.DataFrame({'sensor_idx': _numeric(df, 'sensor_idx')})
+            # time fallback: use specified column or row count
+            if i_t is not None:
+                frame['t'] = _numeric(df, header[i_t])
+            else:
+                frame['t'] = np.arange(rows_seen + 1, rows_seen + len(df) + 1, dtype=np.float64)
+            rows_seen += len(df)
+            for key, name in zip(AXES, names):
+                frame[key] = _numeric(df, name)
+            frame = frame.dropna()
+
+            for sidx, g in frame.groupby(frame['sensor_idx'].astype(np.int64), sort=True):
+                _append_chunk(parts, int(sidx), _sensor_arrays(g['t'], {k: g[k] for k in AXES}))
+        data = _merge_chunks(parts)
+        return data, sorted(data)
+
+    # Wide layout parsing
+    # Identify time column
+    time_col = None
+    for cand in ['t_elapsed_s', 't_sec', 'time', 't', 'timestamp']:
+        if cand in header:
+            time_col = header.index(cand)
+            break
+    if time_col is None:
+        # fallback: first column
+        time_col = 0
+
+    # Build sensor axis map: sensor_id -> axis -> column index
+    # Accept names: Fx, Fy, Fz, Tx, Ty, Tz, Mx, My, Mz (any case) with optional _<id>
+    sensor_axes: Dict[int, Dict[str, int]] = {}
+    for ci, name in enumerate(header):
+        axis_raw, sep, sid_raw = name.partition('_')
+        axis = AXIS_ALIASES.get(axis_raw.upper())
+        if axis is None or (sep and not sid_raw.isdecimal()):
+            continue
+        sid = int(sid_raw) if sep else 0
+        sensor_axes.setdefault(sid, {})[axis] = ci
+
+    # Sensors need all 6 axes to be plotted
+    sensor_cols = {
+        sid: [axes_map[k] for k in AXES]
+        for sid, axes_map in sensor_axes.items()
+        if all(k in axes_map for k in AXES)
+    }
+    if not sensor_cols:
+        return {}, []
+
+    usecols = sorted({time_col}.union(*sensor_cols.values()))
+    pos = {ci: j for j, ci in enumerate(usecols)}
+    sids = sorted(sensor_cols)
+    col_map = np.array([[pos[ci] for ci in sensor_cols[sid]] for sid in sids], dtype=np.intp)
+    names = [header[ci] for ci in usecols]
+    parts: Optional[Dict[int, Dict[str, List[np.ndarray]]]] = None
+    if pa_csv is not None and len(set(names)) == len(names):
+        try:
+            parts = _wide_parts(_arrow_blocks(csv_path, names), sids, col_map, pos[time_col])
+        except (pa.ArrowInvalid, KeyError):
+            parts = None    # non-numeric cell or odd header: let pandas coerce it
+    if parts is None:
+        blocks = (df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+                  for df in pd.read_csv(csv_path, usecols=usecols, engine='c', chunksize=CHUNK_ROWS))
+        parts = _wide_parts(blocks, sids, col_map, pos[time_col])
+
+    data = _merge_chunks(parts)
+    return data, sorted(data)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'lttb'):
+    """
+    Reduce a series to about max_points points.
 
-def downsample(x: List[float], y: List[float], max_points: int):
+    'lttb' (default) uses tsdownsample's MinMaxLTTB (multi-threaded, keeps
+    extrema and the visual shape) when the package is installed, else 'minmax'.
+    'minmax' splits y into max_points // 2 equal buckets and keeps the min and
+    max sample of each, in time order, so spikes survive; 'stride' keeps every
+    n-th sample (cheaper, but aliases oscillating signals).
+    """
     n = min(len(x), len(y))
     if max_points <= 0 or n <= max_points:
         return x, y
-    stride = max(1, n // max_points)
-    return x[::stride], y[::stride]
+    if method == 'lttb':
+        if MinMaxLTTBDownsampler is not None and max_points >= 3:
+            idx = MinMaxLTTBDownsampler().downsample(x[:n], y[:n], n_out=max_points, parallel=True)
+            return x[idx], y[idx]
+        method = 'minmax'
+    buckets = max_points // 2
+    if method == 'stride' or buckets < 1:
+        stride = max(1, n // max_points)
+        # Strided slices of ndarrays are views (no copy)
+        return x[::stride], y[::stride]
+
+    size = n // buckets
+    yb = y[:buckets * size].reshape(buckets, size)
+    pair = np.sort(np.stack([yb.argmin(axis=1), yb.argmax(axis=1)], axis=1), axis=1)
+    idx = (pair + (np.arange(buckets) * size)[:, None]).ravel()
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)     # keep the end of the trace (remainder bucket)
+    return x[idx], y[idx]
+
+
+def _trace_limits(traces: List[Tuple[np.ndarray, np.ndarray, str]]) -> Tuple[float, float, float, float]:
+    """(x0, x1, y0, y1) covering all (t, y, color) traces, with matplotlib-like margins."""
+    x0 = min(float(np.min(t)) for t, _, _ in traces)
+    x1 = max(float(np.max(t)) for t, _, _ in traces)
+    y0 = min(float(np.min(y)) for _, y, _ in traces)
+    y1 = max(float(np.max(y)) for _, y, _ in traces)
+    if x0 == x1:
+        x1 = x0 + 1.0
+    if y0 == y1:
+        y0, y1 = y0 - 1.0, y1 + 1.0
+    # Same headroom as matplotlib's default margins, so edge samples clear the spines
+    xpad, ypad = 0.05 * (x1 - x0), 0.05 * (y1 - y0)
+    return x0 - xpad, x1 + xpad, y0 - ypad, y1 + ypad
+
+
+def rasterize(ax, traces: List[Tuple[np.ndarray, np.ndarray, str]], dpi: Optional[float] = None):
+    """
+    Draw (t, y, color) traces into ax as datashader line images over its current limits.
+
+    The canvas has one pixel per output pixel of the axes (at dpi, default the
+    figure's), so call this after the layout is final. Every sample is then
+    aggregated into the pixel it falls in and the min/max envelope is kept
+    exactly (unlike stride downsampling); the cost is bounded by the image
+    size rather than the point count.
+    """
+    import datashader as ds
+    import datashader.transfer_functions as tf
+    from matplotlib.colors import to_hex
+
+    bbox = ax.get_window_extent()   # display pixels at the figure dpi
+    scale = (dpi or ax.figure.dpi) / ax.figure.dpi
+    width, height = max(1, round(bbox.width * scale)), max(1, round(bbox.height * scale))
+    (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+    cvs = ds.Canvas(plot_width=width, plot_height=height, x_range=(x0, x1), y_range=(y0, y1))
+    for t, y, color in traces:
+        agg = cvs.line(pd.DataFrame({'t': t, 'y': y}), 't', 'y', agg=ds.any())
+        img = tf.shade(agg, cmap=[to_hex(color)], min_alpha=255)
+        # zorder of a Line2D, so grid lines do not cover one-pixel-wide features
+        ax.imshow(np.asarray(img.to_pil()), extent=(x0, x1, y0, y1), aspect='auto',
+                  interpolation='nearest', zorder=2)
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
 
 
 def main():
@@ -227,10 +351,26 @@ def main():
     ap.add_argument('--csv', default='sensor_data.csv', help='path to CSV file (default: sensor_data.csv)')
     ap.add_argument('--sensors', default='all', help="comma-separated sensor indices or 'all'")
     ap.add_argument('--max-points', type=int, default=20000, help='max points per plotted line (downsampled if exceeded)')
+    ap.add_argument('--downsample', choices=['lttb', 'minmax', 'stride'], default='lttb',
+                    help='downsampling when --max-points is exceeded (lttb needs tsdownsample, '
+                         'else minmax; both keep peaks)')
+    ap.add_argument('--rasterize', action='store_true',
+                    help='render full-resolution traces as images with datashader (ignores --max-points)')
     ap.add_argument('--no-grid', action='store_true', help='disable grid for performance')
     ap.add_argument('--save', default=None, help='optional path to save the figure instead of showing')
     args = ap.parse_args()
 
+    # Saving needs no GUI: pick Agg before pyplot loads an interactive backend
+    if args.save:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if args.rasterize:
+        try:
+            import datashader  # noqa: F401
+        except ImportError:
+            print('--rasterize requires datashader (pip install datashader)')
+            return
+
     # Resolve CSV path (try CWD first, then script directory if relative and missing)
     csv_path = args.csv
     if not os.path.isabs(csv_path):
@@ -260,16 +400,31 @@ def main():
     comp_titles = ['Fx [N]', 'Fy [N]', 'Fz [N]', r'$\tau_x$ [N·m]', r'$\tau_y$ [N·m]', r'$\tau_z$ [N·m]']
     colors = ['tab:red', 'tab:blue', 'tab:green', 'tab:orange', 'tab:purple', 'tab:brown']
 
+    raster = []     # (ax, traces) drawn once the layout is final
     for ci, ax in enumerate(axs):
         ax.set_title(comp_titles[ci])
         ax.grid(not args.no_grid)
         key = comp_keys[ci]
+        traces = []
         for si, sidx in enumerate(sensors):
             d = data.get(sidx)
-            if not d or not d['t']:
+            if not d or len(d['t']) == 0:
+                continue
+            color = colors[si % len(colors)]
+            if args.rasterize:
+                traces.append((d['t'], d[key], color))
+                ax.plot([], [], '-', color=color, label=f'S{sidx}')    # legend entry only
                 continue
-            x, y = downsample(d['t'], d[key], args.max_points)
-            ax.plot(x, y, '-', color=colors[si % len(colors)], label=f'S{sidx}')
+            x, y = downsample(d['t'], d[key], args.max_points, args.downsample)
+            ax.plot(x, y, '-', color=color, label=f'S{sidx}')
+        if traces:
+            raster.append((ax, traces))
+    if raster:
+        # Fix the limits before layout; x is shared, so cover every rasterized trace
+        limits = [_trace_limits(traces) for _, traces in raster]
+        for (ax, _), (_, _, y0, y1) in zip(raster, limits):
+            ax.set_ylim(y0, y1)
+        axs[0].set_xlim(min(lim[0] for lim in limits), max(lim[1] for lim in limits))
 
     axs[0].legend(loc='upper right', ncols=min(len(sensors), 3), fontsize=8)
     axs[3].set_xlabel('Time [s]')
@@ -277,9 +432,11 @@ def main():
     axs[5].set_xlabel('Time [s]')
     fig.suptitle(f'CSV Plot: {os.path.basename(csv_path)} (sensors {",".join(map(str, sensors))})', fontsize=12)
     fig.tight_layout()
+    for ax, traces in raster:
+        rasterize(ax, traces, SAVE_DPI if args.save else None)
 
     if args.save:
-        fig.savefig(args.save, dpi=150)
+        fig.savefig(args.save, dpi=SAVE_DPI, bbox_inches='tight')
         print(f'Saved figure: {args.save}')
     else:
         plt.show()
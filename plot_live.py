@@ -20,8 +20,8 @@ Requirements:
 """
 
 import argparse
+import threading
 import time
-from collections import deque
 from types import SimpleNamespace
 import warnings
 import yaml
@@ -49,16 +49,44 @@ def load_config(path: str):
     return cfg
 
 
+LIMIT_TOL = 0.05    # relative change of axis limits that triggers a full redraw
+
+
+def limits_changed(prev, new) -> bool:
+    """True if new (lo, hi) leaves prev or moves either end by > LIMIT_TOL of its span."""
+    if prev is None:
+        return True
+    lo, hi = new
+    p_lo, p_hi = prev
+    tol = LIMIT_TOL * (p_hi - p_lo)
+    return lo < p_lo or hi > p_hi or abs(lo - p_lo) > tol or abs(hi - p_hi) > tol
+
+
+def window_limits(window: np.ndarray):
+    """Per-component (min, max) of a (n_sensors, 6, n) window; NaN if a component has no finite sample."""
+    lo, hi = window.min(axis=(0, 2)), window.max(axis=(0, 2))
+    if not (np.isfinite(lo).all() and np.isfinite(hi).all()):
+        # Rare path (NaN/inf samples): mask them out instead of nanmin/nanmax,
+        # which are slower even on clean data
+        m = np.isfinite(window)
+        lo = np.where(m, window, np.inf).min(axis=(0, 2))
+        hi = np.where(m, window, -np.inf).max(axis=(0, 2))
+        empty = ~m.any(axis=(0, 2))
+        lo[empty] = hi[empty] = np.nan
+    return lo.tolist(), hi.tolist()
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--config', default='config.yaml')
     parser.add_argument('--sensor', type=int, default=None, help='single sensor index to plot (0-based); ignored if --sensors is provided')
     parser.add_argument('--sensors', type=str, default='all', help="comma-separated sensor indices to plot (e.g., '0,1,2'); 'all' for all sensors")
-    parser.add_argument('--window', type=int, default=500, help='number of recent samples to show')
-    parser.add_argument('--interval', type=float, default=0.02, help='target loop interval seconds')
+    parser.add_argument('--window', type=int, default=500, help='number of recent samples to show; one sample is kept per --interval, so the span is about window*interval seconds')
+    parser.add_argument('--interval', type=float, default=0.02, help='render interval seconds (acquisition runs freely)')
     parser.add_argument('--refresh-every', type=int, default=20, help='autoscale and axes update frequency (frames)')
     parser.add_argument('--no-blit', action='store_true', help='disable blitting (fallback full redraw)')
     parser.add_argument('--no-grid', action='store_true', help='disable grid for faster plotting')
+    parser.add_argument('--aa', action='store_true', help='antialias lines (nicer for screenshots, slower)')
     # Optional overrides to avoid editing config.yaml
     parser.add_argument('--src-port', type=int, default=None, help='override source UDP port (e.g., 2001)')
     parser.add_argument('--dest-ip', type=str, default=None, help='override destination IP')
@@ -98,14 +126,21 @@ def main():
         sensors = [0]
 
     ctrl = MMS101Controller(cfg)
+    # ctrl.run() always yields (n_sensors, 6); check the selection against it once
+    if sensors[-1] >= ctrl.n_sensors:
+        raise SystemExit(f'sensor {sensors[-1]} out of range for n_sensors={ctrl.n_sensors}')
 
     # Prepare buffers
     buf_len = max(50, args.window)
     t0 = time.monotonic()
-    ts = deque(maxlen=buf_len)
-    # data_deques[comp_index][sensor_index] -> deque
-    # comp_index: 0..5 => Fx,Fy,Fz,Tx,Ty,Tz
-    data_deques = [[deque(maxlen=buf_len) for _ in sensors] for _ in range(6)]
+    # Ring buffers, written twice (slot and slot + buf_len) so the latest
+    # `count` samples are always one contiguous slice -> zero-copy views
+    # ring[sensor_index, comp_index, :] with comp_index 0..5 => Fx,Fy,Fz,Tx,Ty,Tz
+    ring = np.full((len(sensors), 6, 2 * buf_len), np.nan, dtype=np.float32)
+    ts_ring = np.zeros(2 * buf_len, dtype=np.float64)
+    sensor_rows = np.array(sensors, dtype=np.intp)    # rows of d to plot
+    head = 0    # total samples written
+    count = 0   # valid samples in the window (<= buf_len)
 
     # Matplotlib setup
     plt.ion()
@@ -121,13 +156,21 @@ def main():
         row = []
         for si, sidx in enumerate(sensors):
             color = colors[si % len(colors)]
-            (ln,) = ax.plot([], [], '-', color=color, label=f'S{sidx}')
+            # Aliased, mitered, butt-capped segments are the cheapest for Agg to rasterize
+            (ln,) = ax.plot([], [], '-', color=color, label=f'S{sidx}', antialiased=args.aa,
+                            solid_joinstyle='miter', solid_capstyle='butt', drawstyle='default')
             row.append(ln)
         lines.append(row)
     axs[0].legend(loc='upper right', ncols=min(len(sensors), 3), fontsize=8)
     axs[3].set_xlabel('Time [s]')
     axs[4].set_xlabel('Time [s]')
     axs[5].set_xlabel('Time [s]')
+    # The sensor set is fixed for the run, so the title is set once
+    fig.suptitle(f'MMS-101 Live (sensors {",".join(map(str, sensors))})', fontsize=12)
+
+    # Last applied axis limits; a full redraw happens only when they change
+    ylims = [None] * 6
+    xlim = None
 
     # Try to enable blitting for speed
     use_blit = not args.no_blit
@@ -146,117 +189,148 @@ def main():
         except Exception:
             use_blit = False
 
-    try:
+    # Acquisition runs in a daemon thread so network stalls never block
+    # rendering and draw/blit time never delays the next sample
+    buf_lock = threading.Lock()
+    stop = threading.Event()
+    reader_error = []   # exception that ended the reader, re-raised by the render loop
+
+    def reader():
+        nonlocal head, count
         i = 0
-        frame = 0
-        while True:
-            d = ctrl.run(i)
+        last_kept = -args.interval
+        while not stop.is_set():
+            try:
+                d = ctrl.run(i)    # controller-owned (n_sensors, 6) ndarray, reused each cycle
+            except Exception as e:
+                reader_error.append(e)
+                stop.set()
+                return
             i += 1
-            if d is None:
-                # no data this tick
-                time.sleep(args.interval)
+            now = time.monotonic() - t0
+            # Every reply still feeds the controller's offset calibration, but the
+            # plot keeps one sample per --interval so --window spans a fixed time
+            if now - last_kept < args.interval:
                 continue
-            try:
-                v = np.asarray(d)
-                # Expect shape (n_sensors, 6)
-                if v.ndim != 2 or v.shape[1] < 6:
-                    time.sleep(args.interval)
-                    continue
-            except Exception:
+            last_kept = now
+            with buf_lock:
+                slot = head % buf_len
+                ts_ring[slot] = ts_ring[slot + buf_len] = now
+                # Store values for selected sensors and all 6 components in one slice
+                ring[:, :, slot] = ring[:, :, slot + buf_len] = d[sensor_rows]
+                head += 1
+                count = min(count + 1, buf_len)
+
+    acq = threading.Thread(target=reader, name='mms101-reader', daemon=True)
+    acq.start()
+
+    try:
+        frame = 0
+        last_head = 0
+        while True:
+            if reader_error:
+                raise reader_error[0]
+            # Snapshot the latest window; copies keep the reader free to overwrite the ring
+            with buf_lock:
+                n_new, n_valid = head - last_head, count
+                if n_new and n_valid >= 2:
+                    slot = (head - 1) % buf_len
+                    start, end = slot + buf_len - n_valid + 1, slot + buf_len + 1
+                    ts = ts_ring[start:end].copy()
+                    window = ring[:, :, start:end].copy()
+                last_head = head
+            if not n_new or n_valid < 2:
                 time.sleep(args.interval)
                 continue
 
-            now = time.monotonic() - t0
-            ts.append(now)
-            # Append values for selected sensors and all 6 components
-            for si, sidx in enumerate(sensors):
-                if sidx >= v.shape[0]:
-                    continue
-                for ci in range(6):
-                    try:
-                        data_deques[ci][si].append(float(v[sidx, ci]))
-                    except Exception:
-                        # keep lengths consistent
-                        data_deques[ci][si].append(np.nan)
+            # Update lines (views into the snapshot); every line gets the same ts array
+            for ci, row in enumerate(lines):
+                for ln, y in zip(row, window[:, ci]):
+                    ln.set_xdata(ts)
+                    ln.set_ydata(y)
 
-            # Update lines
-            if len(ts) >= 2:
-                # Set new data on lines
+            # Recompute axes limits at a lower frequency
+            full_redraw = False
+            refresh = frame % max(1, args.refresh_every) == 0
+            if refresh:
+                # Y-limits per component: one reduction over the window
+                lo, hi = window_limits(window)
                 for ci, ax in enumerate(axs):
-                    for si, _ in enumerate(sensors):
-                        lines[ci][si].set_data(ts, data_deques[ci][si])
+                    y_min, y_max = lo[ci], hi[ci]
+                    if y_min == y_min:  # not NaN
+                        if y_min == y_max:
+                            y_min -= 1.0
+                            y_max += 1.0
+                        margin = 0.1 * (y_max - y_min)
+                        y_lim = (y_min - margin, y_max + margin)
+                        if limits_changed(ylims[ci], y_lim):
+                            ax.set_ylim(*y_lim)
+                            ylims[ci] = y_lim
+                            full_redraw = True
+
+            # Shared X-limits, checked every frame: redraw when the newest sample leaves
+            # the view, or on refresh frames when the window start has scrolled noticeably
+            x0 = max(0, ts[0])
+            x1 = ts[-1] if ts[-1] > 5 else 5
+            if (xlim is None or ts[-1] > xlim[1]
+                    or (refresh and abs(x0 - xlim[0]) > LIMIT_TOL * (xlim[1] - xlim[0]))):
+                if ts[-1] > 5:
+                    # headroom keeps new samples on screen; redrawn once it is used up
+                    x1 += 2 * LIMIT_TOL * (x1 - x0)
+                xlim = (x0, x1)
+                for ax in axs:
+                    ax.set_xlim(x0, x1)
+                full_redraw = True
 
-                # Recompute axes limits at a lower frequency
-                full_redraw = False
-                if frame % max(1, args.refresh_every) == 0:
-                    # Y-limits per component
+            if use_blit and background is not None and not full_redraw:
+                try:
+                    # Fast path: restore background and draw only lines
+                    restore_region = getattr(fig.canvas, 'restore_region', None)
+                    if callable(restore_region):
+                        restore_region(background)
                     for ci, ax in enumerate(axs):
-                        y_vals = []
                         for si, _ in enumerate(sensors):
-                            y_vals += [y for y in data_deques[ci][si] if y == y]
-                        if y_vals:
-                            y_min = min(y_vals)
-                            y_max = max(y_vals)
-                            if y_min == y_max:
-                                y_min -= 1.0
-                                y_max += 1.0
-                            margin = 0.1 * (y_max - y_min)
-                            ax.set_ylim(y_min - margin, y_max + margin)
-                    # Shared X-limits
-                    x0 = max(0, ts[0])
-                    x1 = ts[-1] if ts[-1] > 5 else 5
-                    for ax in axs:
-                        ax.set_xlim(x0, x1)
-                    fig.suptitle(f'MMS-101 Live (sensors {",".join(map(str, sensors))})', fontsize=12)
-                    full_redraw = True
-
-                if use_blit and background is not None and not full_redraw:
-                    try:
-                        # Fast path: restore background and draw only lines
-                        restore_region = getattr(fig.canvas, 'restore_region', None)
-                        if callable(restore_region):
-                            restore_region(background)
-                        for ci, ax in enumerate(axs):
-                            for si, _ in enumerate(sensors):
-                                ax.draw_artist(lines[ci][si])
-                        blit = getattr(fig.canvas, 'blit', None)
-                        if callable(blit):
-                            blit(fig.bbox)
-                        fig.canvas.flush_events()
-                    except Exception:
-                        # Fallback to full redraw
-                        fig.canvas.draw()
-                        fig.canvas.flush_events()
-                        # Reset background for subsequent blits
-                        try:
-                            copy_from_bbox = getattr(fig.canvas, 'copy_from_bbox', None)
-                            if callable(copy_from_bbox):
-                                background = copy_from_bbox(fig.bbox)
-                            else:
-                                use_blit = False
-                        except Exception:
-                            use_blit = False
-                else:
-                    # Full redraw when limits change or blit disabled
+                            ax.draw_artist(lines[ci][si])
+                    blit = getattr(fig.canvas, 'blit', None)
+                    if callable(blit):
+                        blit(fig.bbox)
+                    fig.canvas.flush_events()
+                except Exception:
+                    # Fallback to full redraw
                     fig.canvas.draw()
                     fig.canvas.flush_events()
-                    if use_blit:
-                        try:
-                            copy_from_bbox = getattr(fig.canvas, 'copy_from_bbox', None)
-                            if callable(copy_from_bbox):
-                                background = copy_from_bbox(fig.bbox)
-                            else:
-                                use_blit = False
-                        except Exception:
+                    # Reset background for subsequent blits
+                    try:
+                        copy_from_bbox = getattr(fig.canvas, 'copy_from_bbox', None)
+                        if callable(copy_from_bbox):
+                            background = copy_from_bbox(fig.bbox)
+                        else:
+                            use_blit = False
+                    except Exception:
+                        use_blit = False
+            else:
+                # Full redraw when limits change or blit disabled
+                fig.canvas.draw()
+                fig.canvas.flush_events()
+                if use_blit:
+                    try:
+                        copy_from_bbox = getattr(fig.canvas, 'copy_from_bbox', None)
+                        if callable(copy_from_bbox):
+                            background = copy_from_bbox(fig.bbox)
+                        else:
                             use_blit = False
+                    except Exception:
+                        use_blit = False
 
-                frame += 1
+            frame += 1
 
-            # Pace the loop
+            # Pace rendering; acquisition is not throttled
             time.sleep(args.interval)
     except KeyboardInterrupt:
         pass
     finally:
+        stop.set()
+        acq.join(timeout=1.0)
         plt.ioff()
         try:
             plt.show(block=False)